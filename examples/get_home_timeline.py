@@ -19,11 +19,15 @@ async def get_home(**params):
 
     home = []
     async for tweets in responses:
-        for tweet in reversed(tweets):
+        lines = []
+        for tweet in reversed(tweets.data):
             text = html.unescape(tweet.text)
-            print("@{user.screen_name}: {text}".format(user=tweet.user,
-                                                       text=text))
-            print("-" * 10)
+            lines.append("@{screen_name}: {text}\n{sep}".format(
+                screen_name=tweet.user.screen_name, text=text, sep="-" * 10
+            ))
+
+        if lines:
+            print("\n".join(lines))
 
         await asyncio.sleep(180)
 
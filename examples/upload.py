@@ -9,6 +9,8 @@ from urllib.parse import urlparse
 import aiofiles
 
 try:
+    # Pillow-SIMD (pip3 install pillow-simd) can replace Pillow
+    # for faster resizing
     import PIL.Image
 except ImportError:
     PIL = None
@@ -22,9 +24,31 @@ except (SystemError, ImportError):
 client = peony.PeonyClient(**api.keys)
 
 
+class ByteCounter(io.RawIOBase):
+    """ A file object that only counts the bytes written to it """
+
+    def __init__(self):
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return False
+
+    def tell(self):
+        return self.size
+
+    def write(self, data):
+        self.size += len(data)
+        return len(data)
+
+
 def convert(img, formats):
     """
         Convert the image to all the formats specified
+    Only the size of each conversion is computed, the image is then
+    saved using the format giving the smallest file
     Parameters
     ----------
     img : PIL.Image.Image
@@ -36,31 +60,39 @@ def convert(img, formats):
     io.BytesIO
         A file object containing the converted image
     """
-    media = None
+    best = None
     min_size = 0
 
     for kwargs in formats:
-        f = io.BytesIO()
+        image = img
         if img.mode == "RGBA" and kwargs['format'] != "PNG":
             # convert to RGB if picture is too large as a png
             # this implies that the png format is the first in `formats`
             if min_size < 5 * 1024**2:
                 continue
             else:
-                img.convert('RGB')
-
-        img.save(f, **kwargs)
-        size = f.tell()
-
-        if media is None or size < min_size:
-            if media is not None:
-                media.close()
-
-            media = f
+                image = img.convert('RGB')
+
+        try:
+            counter = ByteCounter()
+            image.save(counter, **kwargs)
+            size = counter.size
+        except io.UnsupportedOperation:
+            # some writers (TIFF...) need to seek back in the file
+            buffer = io.BytesIO()
+            image.save(buffer, **kwargs)
+            size = buffer.getbuffer().nbytes
+
+        if best is None or size < min_size:
+            best = image, kwargs
             min_size = size
-        else:
-            f.close()
 
+    if best is None:
+        return None
+
+    image, kwargs = best
+    media = io.BytesIO()
+    image.save(media, **kwargs)
     return media
 
 
@@ -97,7 +129,11 @@ def optimize_media(file_, max_size, formats):
 
     if ratio > 1:
         size = tuple(int(hw // ratio) for hw in img.size)
-        img = img.resize(size, PIL.Image.ANTIALIAS)
+        if img.format == "JPEG":
+            # let libjpeg decode a downscaled picture close to the new size
+            img.draft('RGB', size)
+
+        img = img.resize(size, PIL.Image.LANCZOS)
 
     media = convert(img, formats)
 
@@ -409,7 +409,7 @@ class BasePeonyClient(metaclass=MetaPeonyClient):
     async def run_tasks(self):
         """ Run the tasks attached to the instance """
         tasks = self.get_tasks()
-        self._gathered_tasks = asyncio.gather(*tasks, loop=self.loop)
+        self._gathered_tasks = asyncio.gather(*tasks)
         try:
             await self._gathered_tasks
         except CancelledError:
@@ -642,37 +642,46 @@ class PeonyClient(BasePeonyClient):
         .data_processing.PeonyResponse
             Response of the request
         """
+        opened_file = None
         if isinstance(file_, str):
             url = urlparse(file_)
             if url.scheme.startswith('http'):
                 media = await self._session.get(file_)
             else:
                 path = urlparse(file_).path.strip(" \"'")
-                media = await utils.execute(open(path, 'rb'))
+                media = opened_file = await utils.open_file(path)
         elif hasattr(file_, 'read') or isinstance(file_, bytes):
             media = file_
         else:
             raise TypeError("upload_media input must be a file object or a "
                             "filename or binary data or an aiohttp request")
 
-        media_size = await utils.get_size(media)
-        if chunked is not None:
-            size_test = False
-        else:
-            size_test = media_size > size_limit
+        try:
+            media_size = await utils.get_size(media)
+            if chunked is not None:
+                size_test = False
+            else:
+                size_test = media_size > size_limit
 
-        if isinstance(media, aiohttp.ClientResponse):
-            # send the content of the response
-            media = media.content
+            if isinstance(media, aiohttp.ClientResponse):
+                # send the content of the response
+                media = media.content
 
-        if chunked or (size_test and chunked is None):
-            args = media, media_size, file_, media_type, media_category
-            response = await self._chunked_upload(*args, **params)
-        else:
-            response = await self.upload.media.upload.post(media=media,
-                                                           **params)
+            if chunked or (size_test and chunked is None):
+                args = media, media_size, file_, media_type, media_category
+                response = await self._chunked_upload(*args, **params)
+            else:
+                if opened_file is not None:
+                    # aiohttp can't send files opened using aiofiles
+                    media = await utils.execute(opened_file.read())
 
-        if not hasattr(file_, 'read') and not getattr(media, 'closed', True):
-            media.close()
+                response = await self.upload.media.upload.post(media=media,
+                                                               **params)
+        finally:
+            if opened_file is not None:
+                await utils.execute(opened_file.close())
+            elif not hasattr(file_, 'read') and \
+                    not getattr(media, 'closed', True):
+                media.close()
 
         return response
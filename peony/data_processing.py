@@ -1,5 +1,12 @@
+import codecs
 import json
 import logging
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
 from . import exceptions
 
@@ -10,17 +17,62 @@ class BaseJSONData(dict):
     """
         A dict in which you can access items as attributes
 
+    The JSON objects and arrays it contains are only converted to
+    :class:`JSONData` and :class:`JSONList` when they are accessed.
+
     >>> obj = JSONData(key=True)
     >>> obj['key'] is obj.key
     True
     """
 
     def __getattr__(self, key):
-        if key in self:
+        try:
             return self[key]
+        except KeyError:
+            raise AttributeError("%s has no property named %s." %
+                                 (self.__class__.__name__, key)) from None
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+
+        if type(value) is dict or type(value) is list:
+            value = _wrap(value)
+            dict.__setitem__(self, key, value)
+
+        return value
+
+    def _wrap_values(self):
+        for key, value in list(dict.items(self)):
+            if type(value) is dict or type(value) is list:
+                dict.__setitem__(self, key, _wrap(value))
+
+    def items(self):
+        self._wrap_values()
+        return super().items()
 
-        raise AttributeError("%s has no property named %s." %
-                             (self.__class__.__name__, key))
+    def values(self):
+        self._wrap_values()
+        return super().values()
+
+    def copy(self):
+        self._wrap_values()
+        return super().copy()
+
+    def pop(self, key, *args):
+        return _wrap(super().pop(key, *args))
+
+    def popitem(self):
+        key, value = super().popitem()
+        return key, _wrap(value)
+
+    def setdefault(self, key, default=None):
+        super().setdefault(key, default)
+        return BaseJSONData.__getitem__(self, key)
+
+    def __iter__(self):
+        # dict() and ** copy the values of dict subclasses directly
+        # (without wrapping them) unless __iter__ is overridden
+        return super().__iter__()
 
     def __delattr__(self, item):
         del self[item]
@@ -69,6 +121,10 @@ class JSONData(BaseJSONData):
         return default
 
 
+class JSONList(list):
+    """ A list in which the JSON objects were converted to JSONData """
+
+
 class PeonyResponse:
     """
         Response objects
@@ -104,6 +160,8 @@ class PeonyResponse:
         Requests arguments
     """
 
+    __slots__ = 'data', 'headers', 'url', 'request'
+
     def __init__(self, data, headers, url, request):
         super().__setattr__('data', data)
         super().__setattr__('headers', headers)
@@ -125,6 +183,10 @@ class PeonyResponse:
         """ iterate over the data """
         return iter(self.data)
 
+    def __reversed__(self):
+        """ iterate over the data in reverse order """
+        return reversed(self.data)
+
     def __str__(self):
         """ use the string of the data """
         return str(self.data)
@@ -146,9 +208,24 @@ class PeonyResponse:
     __delattr__ = __delitem__
 
 
+def _wrap(obj):
+    """ convert the JSON object or array to :class:`JSONData` or
+    :class:`JSONList`, the objects it contains are converted on access """
+    if type(obj) is dict:
+        return JSONData(obj)
+
+    if type(obj) is list:
+        return JSONList([_wrap(value) for value in obj])
+
+    return obj
+
+
 def loads(json_data, encoding="utf-8", **kwargs):
     """
-        Custom loads function with an object_hook and automatic decoding
+        Custom loads function returning JSONData and automatic decoding
+
+    orjson is used to decode the data when it is installed and no
+    keyword arguments are given
 
     Parameters
     ----------
@@ -166,10 +243,37 @@ def loads(json_data, encoding="utf-8", **kwargs):
     :obj:`dict` or :obj:`list`
         Decoded json data
     """
+    if orjson is not None and not kwargs:
+        # orjson only decodes UTF-8 data
+        if isinstance(json_data, bytes) and \
+                codecs.lookup(encoding).name != 'utf-8':
+            json_data = json_data.decode(encoding)
+
+        return _wrap(orjson.loads(json_data))
+
     if isinstance(json_data, bytes):
         json_data = json_data.decode(encoding)
 
-    return json.loads(json_data, object_hook=JSONData, **kwargs)
+    return _wrap(json.loads(json_data, **kwargs))
+
+
+def _accepts_bytes(loads_func):
+    """ check whether the loads function can decode utf-8 encoded bytes """
+    return loads_func is loads
+
+
+@lru_cache(maxsize=64)
+def _get_content_kind(ctype):
+    """ get the kind of data of the response from its content type """
+    ctype = ctype.lower()
+
+    if "application/json" in ctype:
+        return 'json'
+
+    if "text" in ctype:
+        return 'text'
+
+    return 'bytes'
 
 
 async def read(response, loads=loads, encoding=None):
@@ -181,7 +285,8 @@ async def read(response, loads=loads, encoding=None):
     response : aiohttp.ClientResponse
         response
     loads : callable
-        json loads function
+        json loads function, it is given the decoded :obj:`str` unless it
+        is :func:`loads` which also accepts :obj:`bytes`
     encoding : :obj:`str`, optional
         character encoding of the response, if set to None
         aiohttp should guess the right encoding
@@ -191,14 +296,29 @@ async def read(response, loads=loads, encoding=None):
     :obj:`bytes`, :obj:`str`, :obj:`dict` or :obj:`list`
         the data returned depends on the response
     """
-    ctype = response.headers.get('Content-Type', "").lower()
+    content_kind = _get_content_kind(response.headers.get('Content-Type', ""))
 
     try:
-        if "application/json" in ctype:
+        if content_kind == 'json':
             logger.debug("decoding data as json")
-            return await response.json(encoding=encoding, loads=loads)
+            data = (await response.read()).strip()
+            if not data:
+                return None
+
+            if encoding is None:
+                # peony's loads decodes bytes as utf-8, other functions
+                # (e.g. json.loads on Python 3.5) may only accept str
+                charset = response.charset
+                if not _accepts_bytes(loads) or \
+                        (charset and charset.lower() not in ('utf-8', 'utf8')):
+                    encoding = response.get_encoding()
+
+            if encoding is not None:
+                data = data.decode(encoding)
+
+            return loads(data)
 
-        if "text" in ctype:
+        if content_kind == 'text':
             logger.debug("decoding data as text")
             return await response.text(encoding=encoding)
 
@@ -298,7 +298,6 @@ class OAuth2Headers(PeonyHeaders):
 
     @property
     def token(self):
-        print("setting token")
         if 'Authorization' in self:
             return self['Authorization'][len("Bearer "):]
 
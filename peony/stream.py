@@ -25,6 +25,7 @@ DISCONNECTION_TIMEOUT = 0.25
 ERROR_TIMEOUT = DISCONNECTION_TIMEOUT
 MAX_DISCONNECTION_TIMEOUT = 16
 ENHANCE_YOUR_CALM_TIMEOUT = 60
+MAX_ENHANCE_YOUR_CALM_TIMEOUT = 960
 
 NORMAL = 0
 DISCONNECTION = 1
@@ -233,7 +234,7 @@ class StreamResponse:
         elif self.state == ENHANCE_YOUR_CALM:
             if self._error_timeout < ENHANCE_YOUR_CALM_TIMEOUT:
                 self._error_timeout = ENHANCE_YOUR_CALM_TIMEOUT
-            else:
+            elif self._error_timeout < MAX_ENHANCE_YOUR_CALM_TIMEOUT:
                 self._error_timeout *= 2
 
             logger.warning("Enhance Your Calm response received from Twitter. "
@@ -2,8 +2,10 @@
 import asyncio
 import logging
 import os
+import random
 import sys
-from functools import partial
+from stat import S_ISREG
+from functools import lru_cache, partial
 from itertools import chain
 from typing import Any, Iterable, Mapping
 
@@ -13,6 +15,11 @@ import peony
 
 from . import exceptions
 
+try:
+    import aiofiles
+except ImportError:  # pragma: no cover
+    aiofiles = None
+
 try:
     import magic
     mime = magic.Magic(mime=True)
@@ -24,6 +31,11 @@ except Exception:  # pragma: no cover
 
 _logger = logging.getLogger(__name__)
 
+RATE_LIMIT_BACKOFF = 60
+MAX_RATE_LIMIT_BACKOFF = 960
+RATE_LIMIT_JITTER = 5
+MAX_TIMEOUT_BACKOFF = 60
+
 
 class Handle:
 
@@ -92,15 +104,17 @@ class ErrorHandler(metaclass=MetaErrorHandler):
         return ErrorHandler.RAISE
 
     async def __call__(self, future=None, **kwargs):
+        request = self.__request
+        if future is not None:
+            request = partial(request, future=future)
+
+        handle = self._handle
+
         while True:
             try:
-                if future is None:
-                    return await self.__request(**kwargs)
-                else:
-                    return await self.__request(future=future, **kwargs)
+                return await request(**kwargs)
             except Exception as exc:
-                status = await self._handle(exc.__class__, exception=exc,
-                                            **kwargs)
+                status = await handle(exc.__class__, exception=exc, **kwargs)
 
                 if isinstance(status, Exception):
                     exc = status
@@ -119,30 +133,45 @@ class DefaultErrorHandler(ErrorHandler):
     """
         The default error_handler
 
-    The decorated request will retry infinitely on any handled error
+    The decorated request will retry on any handled error
     The exceptions handled are :class:`TimeoutError`,
     :class:`asyncio.TimeoutError`,
     :class:`exceptions.RateLimitExceeded` and
     :class:`exceptions.ServiceUnavailable`
+
+    Rate limits and timeouts are retried using an exponential backoff,
+    timeouts are only retried ``timeout_tries`` times.
     """
 
-    def __init__(self, request, tries=3):
+    def __init__(self, request, tries=3, timeout_tries=8):
         super().__init__(request)
         self.tries = tries
+        self.timeout_tries = timeout_tries
+        self.rate_limit_attempts = 0
+        self.timeout_attempts = 0
 
     @ErrorHandler.handle(exceptions.RateLimitExceeded)
     async def handle_rate_limits(self, exception, url):
-        delay = int(exception.reset_in) + 1
-        fmt = "Sleeping for {}s (rate limit exceeded on endpoint {})"
-        _logger.warning(fmt.format(delay, url))
+        backoff = RATE_LIMIT_BACKOFF * 2 ** self.rate_limit_attempts
+        backoff = min(backoff, MAX_RATE_LIMIT_BACKOFF)
+        delay = max(int(exception.reset_in) + 1, backoff)
+        delay += random.uniform(0, RATE_LIMIT_JITTER)
+        self.rate_limit_attempts += 1
+
+        _logger.warning("Sleeping for %.0fs (rate limit exceeded on "
+                        "endpoint %s)", delay, url)
         await asyncio.sleep(delay)
         return ErrorHandler.RETRY
 
     @ErrorHandler.handle(asyncio.TimeoutError, TimeoutError)
-    def handle_timeout_error(self, url):
-        fmt = "Request to {url} timed out, retrying"
-        _logger.info(fmt.format(url=url))
-        return ErrorHandler.RETRY
+    async def handle_timeout_error(self, url):
+        self.timeout_attempts += 1
+        if self.timeout_attempts <= self.timeout_tries:
+            delay = min(2 ** (self.timeout_attempts - 1), MAX_TIMEOUT_BACKOFF)
+            _logger.info("Request to %s timed out, retrying in %ds",
+                         url, delay)
+            await asyncio.sleep(delay)
+            return ErrorHandler.RETRY
 
     @ErrorHandler.handle(exceptions.HTTPServiceUnavailable)
     async def handle_service_unavailable(self):
@@ -184,6 +213,11 @@ def get_args(func, skip=0):
     if code is None:
         code = func.__call__.__code__
 
+    return _get_code_args(code, skip)
+
+
+@lru_cache(maxsize=512)
+def _get_code_args(code, skip):
     return code.co_varnames[skip:code.co_argcount]
 
 
@@ -203,14 +237,16 @@ def log_error(msg=None, exc_info=None, logger=None, **kwargs):
     if logger is None:
         logger = _logger
 
+    # the traceback is only formatted by the handlers of the logger
+    if not logger.isEnabledFor(logging.ERROR):
+        return
+
     if not exc_info:
         exc_info = sys.exc_info()
 
     if msg is None:
         msg = ""
 
-    exc_class, exc_msg, _ = exc_info
-
     if all(info is not None for info in exc_info):
         logger.error(msg, exc_info=exc_info)
 
@@ -248,6 +284,49 @@ async def get_media_metadata(data, path=None):
     return media_type, media_category
 
 
+async def open_file(path):
+    """
+        Open a file in binary mode
+
+    The file is opened using aiofiles when it is installed so that reading
+    the file does not block the event loop
+
+    Parameters
+    ----------
+    path : str
+        path to the file
+
+    Returns
+    -------
+    file object
+        The file object of the file
+    """
+    if aiofiles is not None:
+        return await aiofiles.open(path, 'rb')
+
+    return open(path, 'rb')
+
+
+async def _get_file_size(media):
+    """ get the size of a regular file from its file descriptor """
+    try:
+        fileno = media.fileno()
+
+        # fstat doesn't know about the data still in the buffer, files
+        # opened for reading only have nothing to flush
+        mode = getattr(media, 'mode', None)
+        writable = not isinstance(mode, str) or any(c in mode for c in '+wax')
+        if writable and hasattr(media, 'flush'):
+            await execute(media.flush())
+
+        stat = os.fstat(fileno)
+    except (AttributeError, OSError, TypeError, ValueError):
+        return None
+
+    if S_ISREG(stat.st_mode):
+        return stat.st_size
+
+
 async def get_size(media):
     """
         Get the size of a file
@@ -263,8 +342,21 @@ async def get_size(media):
         The size of the file
     """
     if hasattr(media, 'seek'):
-        await execute(media.seek(0, os.SEEK_END))
-        size = await execute(media.tell())
+        size = await _get_file_size(media)
+
+        if size is None:
+            # seek returns the new position of most file objects
+            size = media.seek(0, os.SEEK_END)
+            is_coro = asyncio.iscoroutine(size)
+
+            if is_coro:
+                size = await size
+
+            if size is None:
+                size = media.tell()
+                if is_coro:
+                    size = await size
+
         await execute(media.seek(0))
     elif hasattr(media, 'headers'):
         size = int(media.headers['Content-Length'])
@@ -278,6 +370,33 @@ async def get_size(media):
     return size
 
 
+# file signatures of the media accepted by Twitter as
+# ((offset, bytes), ...), mimetype
+_signatures = (
+    (((0, b'\x89PNG\r\n\x1a\n'),), "image/png"),
+    (((0, b'\xff\xd8\xff'),), "image/jpeg"),
+    (((0, b'GIF87a'),), "image/gif"),
+    (((0, b'GIF89a'),), "image/gif"),
+    (((0, b'RIFF'), (8, b'WEBP')), "image/webp"),
+    (((4, b'ftypqt  '),), "video/quicktime"),
+    # only the mp4 brands, other ISO base media brands (heic, avif, M4A...)
+    # are left to magic
+    (((4, b'ftypisom'),), "video/mp4"),
+    (((4, b'ftypiso2'),), "video/mp4"),
+    (((4, b'ftypmp41'),), "video/mp4"),
+    (((4, b'ftypmp42'),), "video/mp4"),
+    (((4, b'ftypavc1'),), "video/mp4"),
+    (((4, b'ftypM4V '),), "video/mp4"),
+)
+
+
+def _get_type_from_signature(data):
+    """ guess the mimetype of the most common media from their headers """
+    for signature, media_type in _signatures:
+        if all(data.startswith(sig, offset) for offset, sig in signature):
+            return media_type
+
+
 async def get_type(media, path=None):
     """
     Parameters
@@ -294,6 +413,11 @@ async def get_type(media, path=None):
     str
         The category of the media on Twitter
     """
+    if isinstance(media, bytes):
+        media_type = _get_type_from_signature(media)
+        if media_type is not None:
+            return media_type
+
     if magic:
         if not media:
             raise TypeError("Media data is empty")
@@ -315,17 +439,24 @@ async def get_type(media, path=None):
     return media_type
 
 
+_categories = {
+    'video': "tweet_video",
+    'image/gif': "tweet_gif",
+    'image': "tweet_image"
+}
+
+
 def get_category(media_type):
-    if media_type.startswith('video'):
-        return "tweet_video"
-    elif media_type.endswith('gif'):
-        return "tweet_gif"
-    elif media_type.startswith('image'):
-        return "tweet_image"
-    else:
+    category = _categories.get(media_type)
+    if category is None:
+        category = _categories.get(media_type.split('/', 1)[0])
+
+    if category is None:
         raise RuntimeError("The provided media cannot be handled.\n"
                            "mimetype: %s" % media_type)
 
+    return category
+
 
 async def execute(coro):
     """
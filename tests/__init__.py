@@ -129,6 +129,15 @@ class MockResponse:
     async def read(self):
         return self.data
 
+    @property
+    def charset(self):
+        ctype = self.headers['Content-Type']
+        if 'charset=' in ctype:
+            return ctype.split('charset=')[1].split(';')[0].strip()
+
+    def get_encoding(self):
+        return self.charset or 'utf-8'
+
     async def text(self, encoding=None):
         if encoding is None:
             encoding = 'utf-8'
@@ -1,5 +1,6 @@
 import asyncio
 import json
+from unittest.mock import patch
 
 import aiohttp
 import pytest
@@ -70,6 +71,17 @@ def test_response_iter():
         assert i == x
 
 
+def test_response_reversed():
+    resp = data_processing.PeonyResponse(list(range(3)), {}, "", {})
+    assert list(reversed(resp)) == [2, 1, 0]
+    assert type(reversed(resp)) is type(reversed([]))
+
+
+def test_response_slots(response):
+    with pytest.raises(AttributeError):
+        object.__getattribute__(response, '__dict__')
+
+
 def test_response_str(response):
     assert str(response) == str(response.data)
 
@@ -88,6 +100,70 @@ def test_loads():
     assert j.a == 1 and j.b == 2
 
 
+@pytest.mark.parametrize('orjson', [data_processing.orjson, None])
+def test_loads_nested(orjson):
+    with patch.object(data_processing, 'orjson', orjson):
+        j = data_processing.loads(b"""{"a": {"b": [{"c": 1}, 2]}}""")
+
+    assert isinstance(j, data_processing.JSONData)
+    assert isinstance(j.a, data_processing.JSONData)
+    assert isinstance(j.a.b[0], data_processing.JSONData)
+    assert j.a.b[0].c == 1 and j.a.b[1] == 2
+
+
+def test_loads_lazy():
+    j = data_processing.loads("""[{"a": {"b": [{"c": 1}]}}]""")
+    assert isinstance(j, data_processing.JSONList)
+    assert type(dict.__getitem__(j[0], 'a')) is dict
+
+    assert isinstance(j[0].a, data_processing.JSONData)
+    assert j[0].a is j[0]['a']
+    assert isinstance(j[0].a.b, data_processing.JSONList)
+    assert j[0].a.b[0].c == 1
+
+
+def test_loads_lazy_items():
+    j = data_processing.loads("""{"a": {"b": 1}, "c": [{"d": 2}]}""")
+
+    items = dict(j.items())
+    assert isinstance(items['a'], data_processing.JSONData)
+    assert isinstance(items['c'], data_processing.JSONList)
+
+    a, c = j.values()
+    assert a.b == 1 and c[0].d == 2
+
+    copy = j.copy()
+    assert copy['a'] is j.a
+    assert copy['c'][0].d == 2
+
+
+def test_loads_lazy_pop():
+    j = data_processing.loads("""{"a": {"b": 1}, "c": {"d": 2},
+                                   "e": {"f": 3}}""")
+
+    assert j.pop('a').b == 1
+    assert j.setdefault('c').d == 2
+    assert j.setdefault('g', {'h': 4}).h == 4
+    key, value = j.popitem()
+    assert isinstance(value, data_processing.JSONData)
+
+
+def test_loads_lazy_copy():
+    j = data_processing.loads("""{"a": {"b": 1}}""")
+    assert dict(j)['a'].b == 1
+
+    j = data_processing.loads("""{"a": {"b": 1}}""")
+    assert {**j}['a'].b == 1
+
+    j = data_processing.loads("""{"a": {"b": 1}}""")
+    assert (lambda **kwargs: kwargs)(**j)['a'].b == 1
+
+
+def test_loads_encoding():
+    data = """{"a": "é"}""".encode('latin-1')
+    assert data_processing.loads(data, encoding='latin-1').a == "é"
+
+
 @pytest.mark.asyncio
 async def test_read(json_data):
     response = MockResponse(data=MockResponse.message,
@@ -107,6 +183,57 @@ async def test_read(json_data):
     assert await data == MockResponse.message.encode()
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize('encoding', [None, 'utf-8'])
+async def test_read_json_loads(encoding):
+    def loads(data):
+        assert isinstance(data, str)
+        return data_processing.loads(data)
+
+    response = MockResponse(data='{"a": 1}', content_type="application/json")
+    data = await data_processing.read(response, loads=loads,
+                                      encoding=encoding)
+    assert data.a == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('data', [b'', b' \r\n'])
+async def test_read_json_empty(data):
+    response = MockResponse(data=data, content_type="application/json")
+    assert await data_processing.read(response) is None
+
+
+@pytest.mark.asyncio
+async def test_read_json_charset():
+    response = MockResponse(data='{"a": "é"}'.encode('iso-8859-1'),
+                            content_type="application/json; "
+                                         "charset=iso-8859-1")
+    data = await data_processing.read(response)
+    assert data.a == "é"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('content_type', ["application/json",
+                                          "application/json; charset=UTF-8"])
+async def test_read_json_bytes(content_type):
+    response = MockResponse(data='{"a": "é"}', content_type=content_type)
+    with patch.object(data_processing, 'loads',
+                      wraps=data_processing.loads) as loads:
+        data = await data_processing.read(response, loads=loads)
+
+    assert isinstance(loads.call_args[0][0], bytes)
+    assert data.a == "é"
+
+
+@pytest.mark.asyncio
+async def test_read_json_custom_loads_charset():
+    response = MockResponse(data='{"a": "é"}'.encode('iso-8859-1'),
+                            content_type="application/json; "
+                                         "charset=iso-8859-1")
+    data = await data_processing.read(response, loads=json.loads)
+    assert data == {'a': "é"}
+
+
 @pytest.mark.asyncio
 async def test_read_decode_error():
     response = MockResponse(data=b'\x80', content_type="text/plain")
@@ -1,6 +1,5 @@
 
 import asyncio
-import json
 from unittest.mock import patch
 
 import aiohttp
@@ -12,64 +11,86 @@ from peony import exceptions
 from peony.stream import (DISCONNECTION, DISCONNECTION_TIMEOUT,
                           ENHANCE_YOUR_CALM, ENHANCE_YOUR_CALM_TIMEOUT, EOF,
                           ERROR, ERROR_TIMEOUT, MAX_DISCONNECTION_TIMEOUT,
+                          MAX_ENHANCE_YOUR_CALM_TIMEOUT,
                           MAX_RECONNECTION_TIMEOUT, NORMAL, RECONNECTION,
                           RECONNECTION_TIMEOUT)
 
 from . import MockResponse
 
-content = [{'text': MockResponse.message + " #%d" % i} for i in range(10)]
-data = '\n'.join(json.dumps(line) for line in content) + '\n'
+pytestmark = pytest.mark.asyncio
+
+MSG = MockResponse.message
+EXPECTED = tuple("{} #{}".format(MSG, i) for i in range(10))
+
+# MSG has no character that would need to be escaped in JSON
+data = ''.join('{{"text": "{}"}}\n'.format(text) for text in EXPECTED)
+DATA_BYTES = data.encode()
 
 
 async def stream_content(*args, **kwargs):
-    return MockResponse(data=data, status=200)
+    return MockResponse(data=DATA_BYTES, status=200)
+
+
+async def create_session():
+    return aiohttp.ClientSession()
 
 
-class Stream:
+@pytest.fixture(scope='session')
+def shared_session():
+    # the requests of the session are patched so it is never used
+    # in the loop it was created in
+    loop = asyncio.new_event_loop()
+    session = loop.run_until_complete(create_session())
+    yield session
+    loop.run_until_complete(session.close())
+    loop.close()
 
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
-        self.client = peony.client.BasePeonyClient("", "",
-                                                   session=self.session)
 
-        self.patch = patch.object(self.session, 'request',
-                                  side_effect=stream_content)
-        self.patch.__enter__()
+@pytest.fixture
+def peony_client(event_loop, shared_session):
+    client = peony.client.BasePeonyClient("", "", session=shared_session)
+    yield client
+    event_loop.run_until_complete(client.close())
 
-        return peony.stream.StreamResponse(
-            client=self.client,
+
+@pytest.fixture
+def stream(peony_client, shared_session):
+    with patch.object(shared_session, 'request', side_effect=stream_content):
+        yield peony.stream.StreamResponse(
+            client=peony_client,
             method='get',
             url="http://whatever.com/stream"
         )
 
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        self.patch.__exit__(exc_type, exc_val, exc_tb)
-        await self.session.close()
-        await self.client.close()
 
+@pytest.fixture
+def no_sleep(monkeypatch):
+    async def sleep(*args, **kwargs):
+        pass
 
-@pytest.mark.asyncio
-async def test_stream_connect():
-    async with Stream() as stream:
-        response = await stream._connect()
-        assert data == await response.text()
+    monkeypatch.setattr(peony.stream.asyncio, 'sleep', sleep)
 
 
-@pytest.mark.asyncio
-async def test_stream_connect_with_session():
-    async with aiohttp.ClientSession() as session:
-        client = peony.client.BasePeonyClient("", "")
+async def test_stream_connect(stream):
+    response = await stream._connect()
+    assert DATA_BYTES == await response.read()
 
-        stream = peony.stream.StreamResponse(
-            client=client,
-            method='get',
-            url="http://whatever.com/stream",
-            session=session
-        )
 
-        with patch.object(session, 'request', side_effect=stream_content):
-            response = await stream._connect()
-            assert data == await response.text()
+async def test_stream_connect_with_session(shared_session):
+    client = peony.client.BasePeonyClient("", "")
+
+    stream = peony.stream.StreamResponse(
+        client=client,
+        method='get',
+        url="http://whatever.com/stream",
+        session=shared_session
+    )
+
+    with patch.object(shared_session, 'request', side_effect=stream_content):
+        response = await stream._connect()
+        assert DATA_BYTES == await response.read()
+
+    await client.close()
 
 
 async def _stream_iteration(stream):
@@ -77,33 +98,38 @@ async def _stream_iteration(stream):
         raise StopAsyncIteration
 
     with patch.object(stream, 'init_restart', side_effect=stop):
+        # the stream can already be over when iterated a second time
+        async for line in stream:
+            assert 'connected' in line
+            break
+
         i = 0
-        connected = False
         async for line in stream:
-            if connected is False:
-                connected = True
-                assert 'connected' in line
-            else:
-                assert line['text'] == MockResponse.message + " #%d" % i
-                i += 1
+            assert line['text'] == EXPECTED[i]
+            i += 1
 
 
-@pytest.mark.asyncio
-async def test_stream_iteration():
-    async with Stream() as stream:
-        await _stream_iteration(stream)
+async def test_stream_iteration(stream):
+    await _stream_iteration(stream)
+
+
+# the stream only checks the status of these responses, they are never read
+# or closed so the same response can be returned on every connection
+disconnection = MockResponse(status=500)
+calm = MockResponse(status=429)
+reconnection = MockResponse(status=501)
 
 
 async def response_disconnection():
-    return MockResponse(status=500)
+    return disconnection
 
 
 async def response_calm():
-    return MockResponse(status=429)
+    return calm
 
 
 async def response_reconnection():
-    return MockResponse(status=501)
+    return reconnection
 
 
 async def response_forbidden():
@@ -115,262 +141,176 @@ async def response_stream_limit():
 
 
 async def response_eof(*args, **kwargs):
-    return MockResponse(data=data, status=200, eof=True)
+    return MockResponse(data=DATA_BYTES, status=200, eof=True)
+
+
+@pytest.mark.parametrize('response,state,get_timeout,max_timeout', [
+    (response_disconnection, DISCONNECTION,
+     lambda turn: DISCONNECTION_TIMEOUT * (turn + 1) / 2,
+     MAX_DISCONNECTION_TIMEOUT),
+    (response_reconnection, RECONNECTION,
+     lambda turn: RECONNECTION_TIMEOUT << (turn // 2),
+     MAX_RECONNECTION_TIMEOUT),
+    (response_calm, ENHANCE_YOUR_CALM,
+     lambda turn: ENHANCE_YOUR_CALM_TIMEOUT << (turn // 2),
+     MAX_ENHANCE_YOUR_CALM_TIMEOUT)
+], ids=['disconnection', 'reconnection', 'enhance_your_calm'])
+async def test_stream_reconnection(stream, no_sleep, response, state,
+                                   get_timeout, max_timeout):
+    turn = -1
 
+    with patch.object(stream, '_connect', side_effect=response):
+        async for data in stream:
+            assert stream._state == state
+            turn += 1
 
-@pytest.mark.asyncio
-async def test_stream_reconnection_disconnection():
-    async def dummy(*args, **kwargs):
-        pass
+            if turn == 0:
+                assert data == {'connected': True}
+            elif turn % 2 == 1:
+                timeout = get_timeout(turn)
 
-    turn = -1
+                if timeout > max_timeout:
+                    assert data['reconnecting_in'] == max_timeout
+                    break
+
+                assert data['reconnecting_in'] == timeout
+                assert data['error'] is None
+            else:
+                assert data.get('stream_restart') is True
 
-    async with Stream() as stream:
-        with patch.object(stream, '_connect',
-                          side_effect=response_disconnection):
-            with patch.object(peony.stream.asyncio, 'sleep',
-                              side_effect=dummy):
-                async for data in stream:
-                    assert stream._state == DISCONNECTION
-                    turn += 1
-
-                    if turn == 0:
-                        assert data == {'connected': True}
-                    elif turn % 2 == 1:
-                        timeout = DISCONNECTION_TIMEOUT * (turn + 1) / 2
-
-                        if timeout > MAX_DISCONNECTION_TIMEOUT:
-                            actual = data['reconnecting_in']
-                            assert actual == MAX_DISCONNECTION_TIMEOUT
-                            break
-
-                        assert data == {'reconnecting_in': timeout,
-                                        'error': None}
-                    else:
-                        assert data == {'stream_restart': True}
-
-
-@pytest.mark.asyncio
-async def test_stream_reconnection_reconnect():
-    async def dummy(*args, **kwargs):
-        pass
 
+async def test_stream_eof_reconnect(stream, no_sleep):
     turn = -1
 
-    async with Stream() as stream:
-        with patch.object(stream, '_connect',
-                          side_effect=response_reconnection):
-            with patch.object(peony.stream.asyncio, 'sleep',
-                              side_effect=dummy):
-                async for data in stream:
-                    assert stream._state == RECONNECTION
-                    turn += 1
-
-                    if turn == 0:
-                        assert data == {'connected': True}
-                    elif turn % 2 == 1:
-                        timeout = RECONNECTION_TIMEOUT * 2**(turn // 2)
-
-                        if timeout > MAX_RECONNECTION_TIMEOUT:
-                            actual = data['reconnecting_in']
-                            assert actual == MAX_RECONNECTION_TIMEOUT
-                            break
-
-                        assert data == {'reconnecting_in': timeout,
-                                        'error': None}
-                    else:
-                        assert data == {'stream_restart': True}
-
-
-@pytest.mark.asyncio
-async def test_stream_eof_reconnect():
-    async def dummy(*args, **kwargs):
-        pass
+    with patch.object(stream, '_connect',
+                      side_effect=response_eof):
+        async for data in stream:
+            turn += 1
+
+            if turn == 0:
+                assert data == {'connected': True}
+            elif turn % 2 == 1:
+                assert stream._state == EOF
+                assert data['reconnecting_in'] == 0
+                assert data['error'] is None
+            else:
+                assert data.get('stream_restart') is True
+                break
 
-    turn = -1
 
-    async with Stream() as stream:
-        with patch.object(stream, '_connect',
-                          side_effect=response_eof):
-            with patch.object(peony.stream.asyncio, 'sleep',
-                              side_effect=dummy):
-                async for data in stream:
-                    turn += 1
-
-                    if turn == 0:
-                        assert data == {'connected': True}
-                    elif turn % 2 == 1:
-                        assert stream._state == EOF
-                        assert data == {'reconnecting_in': 0,
-                                        'error': None}
-                    else:
-                        assert data == {'stream_restart': True}
-                        break
-
-
-@pytest.mark.asyncio
-async def test_stream_reconnection_enhance_your_calm():
-    async def dummy(*args, **kwargs):
-        pass
+async def test_stream_reconnection_error(stream):
+    with patch.object(stream, '_connect', side_effect=response_forbidden):
+        with pytest.raises(exceptions.HTTPForbidden):
+            await stream.connect()
 
-    turn = -1
 
-    async with Stream() as stream:
-        with patch.object(stream, '_connect', side_effect=response_calm):
-            with patch.object(peony.stream.asyncio, 'sleep',
-                              side_effect=dummy):
-                async for data in stream:
-                    assert stream._state == ENHANCE_YOUR_CALM
-                    turn += 1
-
-                    if turn >= 100:
-                        break
-
-                    if turn == 0:
-                        assert data == {'connected': True}
-                    elif turn % 2 == 1:
-                        timeout = ENHANCE_YOUR_CALM_TIMEOUT * 2**(turn // 2)
-                        assert data == {'reconnecting_in': timeout,
-                                        'error': None}
-                    else:
-                        assert data == {'stream_restart': True}
-
-
-@pytest.mark.asyncio
-async def test_stream_reconnection_error():
-    async with Stream() as stream:
-        with patch.object(stream, '_connect', side_effect=response_forbidden):
-            with pytest.raises(exceptions.HTTPForbidden):
-                await stream.connect()
-
-
-@pytest.mark.asyncio
-async def test_stream_reconnection_stream_limit():
-    async with Stream() as stream:
-        with patch.object(stream, '_connect',
-                          side_effect=response_stream_limit):
-            assert stream._state == NORMAL
-            data = await stream.__anext__()
-            assert 'connected' in data
+async def test_stream_reconnection_stream_limit(stream):
+    with patch.object(stream, '_connect',
+                      side_effect=response_stream_limit):
+        assert stream._state == NORMAL
+        data = await stream.__anext__()
+        assert 'connected' in data
 
-            data = await stream.__anext__()
-            assert stream.state == ERROR
-            assert data['reconnecting_in'] == ERROR_TIMEOUT
-            assert isinstance(data['error'], exceptions.StreamLimit)
+        data = await stream.__anext__()
+        assert stream.state == ERROR
+        assert data['reconnecting_in'] == ERROR_TIMEOUT
+        assert isinstance(data['error'], exceptions.StreamLimit)
 
 
-@pytest.mark.asyncio
-async def test_stream_reconnection_error_on_reconnection():
-    async with Stream() as stream:
-        with patch.object(stream, '_connect',
-                          side_effect=response_disconnection):
-            await stream.connect()
-            assert stream._state == DISCONNECTION
-            data = {'reconnecting_in': DISCONNECTION_TIMEOUT,
-                    'error': None}
-            assert data == await stream.__anext__()
-            assert stream._reconnecting
-
-        with patch.object(stream, '_connect', side_effect=response_calm):
-            stream._error_timeout = 0
-            assert {'stream_restart': True} == await stream.__anext__()
-            assert stream._state == ENHANCE_YOUR_CALM
-
-            data = {'reconnecting_in': ENHANCE_YOUR_CALM_TIMEOUT,
-                    'error': None}
-            assert data == await stream.__anext__()
-
-
-@pytest.mark.asyncio
-async def test_stream_init_restart_wrong_state():
-    async with Stream() as stream:
-        stream.state = peony.stream.NORMAL
-        with pytest.raises(RuntimeError):
-            await stream.init_restart()
-
-
-@pytest.mark.asyncio
-async def test_stream_reconnection_handled_errors():
-    async with Stream() as stream:
-        async def handled_error():
-            raise peony.stream.HandledErrors[0]
-
-        with patch.object(stream, '_connect', side_effect=stream_content):
-            data = await stream.__anext__()
-            assert 'connected' in data
-            with patch.object(stream.response, 'readline',
-                              side_effect=handled_error):
-                data = await stream.__anext__()
-                assert data == {'reconnecting_in': ERROR_TIMEOUT,
-                                'error': None}
-
-
-@pytest.mark.asyncio
-async def test_stream_reconnection_client_connection_error():
-    async with Stream() as stream:
-        async def client_connection_error():
-            raise aiohttp.ClientConnectionError
-
-        with patch.object(stream, '_connect', side_effect=stream_content):
-            data = await stream.__anext__()
-            assert 'connected' in data
-            with patch.object(stream.response, 'readline',
-                              side_effect=client_connection_error):
-                data = await stream.__anext__()
-                assert data == {'reconnecting_in': ERROR_TIMEOUT,
-                                'error': None}
-
-
-@pytest.mark.asyncio
-async def test_stream_async_context():
-    async with aiohttp.ClientSession() as session:
-        client = peony.client.BasePeonyClient("", "", session=session)
-        context = peony.stream.StreamResponse(method='GET',
-                                              url="http://whatever.com/stream",
-                                              client=client)
-
-        async with context as stream:
-            with patch.object(stream, '_connect', side_effect=stream_content):
-                await _stream_iteration(stream)
+async def test_stream_reconnection_error_on_reconnection(stream):
+    # the stream is created for this test only, no need to restore _connect
+    stream._connect = response_disconnection
+    await stream.connect()
+    assert stream._state == DISCONNECTION
+    data = {'reconnecting_in': DISCONNECTION_TIMEOUT,
+            'error': None}
+    assert data == await stream.__anext__()
+    assert stream._reconnecting
 
-        assert context.response.closed
+    stream._connect = response_calm
+    stream._error_timeout = 0
+    assert {'stream_restart': True} == await stream.__anext__()
+    assert stream._state == ENHANCE_YOUR_CALM
 
+    data = {'reconnecting_in': ENHANCE_YOUR_CALM_TIMEOUT,
+            'error': None}
+    assert data == await stream.__anext__()
 
-@pytest.mark.asyncio
-async def test_stream_context():
-    async with aiohttp.ClientSession() as session:
-        client = peony.client.BasePeonyClient("", "", session=session)
-        context = peony.stream.StreamResponse(method='GET',
-                                              url="http://whatever.com/stream",
-                                              client=client)
 
-        with context as stream:
-            with patch.object(stream, '_connect', side_effect=stream_content):
-                await _stream_iteration(stream)
+async def test_stream_init_restart_wrong_state(stream):
+    stream.state = peony.stream.NORMAL
+    with pytest.raises(RuntimeError):
+        await stream.init_restart()
 
-        assert context.response.closed
 
+async def test_stream_reconnection_handled_errors(stream, monkeypatch):
+    async def handled_error():
+        raise peony.stream.HandledErrors[0]
 
-@pytest.mark.asyncio
-async def test_stream_context_response_already_closed():
-    async with aiohttp.ClientSession() as session:
-        client = peony.client.BasePeonyClient("", "", session=session)
-        context = peony.stream.StreamResponse(method='GET',
-                                              url="http://whatever.com/stream",
-                                              client=client)
+    with patch.object(stream, '_connect', side_effect=stream_content):
+        data = await stream.__anext__()
+        assert 'connected' in data
+        monkeypatch.setattr(stream.response, 'readline', handled_error)
+        data = await stream.__anext__()
+        assert data == {'reconnecting_in': ERROR_TIMEOUT,
+                        'error': None}
 
-        with context as stream:
-            with patch.object(stream, '_connect', side_effect=stream_content):
-                await _stream_iteration(stream)
-                stream.response.close()
 
-        assert context.response.closed
+async def test_stream_reconnection_client_connection_error(stream,
+                                                           monkeypatch):
+    async def client_connection_error():
+        raise aiohttp.ClientConnectionError
+
+    with patch.object(stream, '_connect', side_effect=stream_content):
+        data = await stream.__anext__()
+        assert 'connected' in data
+        monkeypatch.setattr(stream.response, 'readline',
+                            client_connection_error)
+        data = await stream.__anext__()
+        assert data == {'reconnecting_in': ERROR_TIMEOUT,
+                        'error': None}
+
+
+def _patched_stream(client):
+    stream = peony.stream.StreamResponse(method='GET',
+                                         url="http://whatever.com/stream",
+                                         client=client)
+    stream._connect = stream_content
+    return stream
+
+
+async def test_stream_async_context(peony_client):
+    context = _patched_stream(peony_client)
+
+    async with context as stream:
+        await _stream_iteration(stream)
+
+    assert context.response.closed
 
 
-@pytest.mark.asyncio
-async def test_stream_cancel(event_loop):
+async def test_stream_context(peony_client):
+    context = _patched_stream(peony_client)
+
+    with context as stream:
+        await _stream_iteration(stream)
+
+    assert context.response.closed
+
+
+async def test_stream_context_response_already_closed(peony_client):
+    context = _patched_stream(peony_client)
+
+    with context as stream:
+        await _stream_iteration(stream)
+        stream.response.close()
+
+    assert context.response.closed
+
+
+async def test_stream_cancel(event_loop, peony_client):
     async def cancel(task):
-        await asyncio.sleep(0.001)
+        # let the stream start before cancelling it
+        await asyncio.sleep(0)
         task.cancel()
 
     async def test_stream_iterations(stream):
@@ -378,30 +318,27 @@ async def test_stream_cancel(event_loop):
             while True:
                 await _stream_iteration(stream)
 
-    async with aiohttp.ClientSession() as session:
-        client = peony.client.BasePeonyClient("", "", session=session)
-        context = peony.stream.StreamResponse(method='GET',
-                                              url="http://whatever.com",
-                                              client=client)
-
-        with context as stream:
-            with patch.object(stream, '_connect',
-                              side_effect=stream_content):
-                coro = test_stream_iterations(stream)
-                task = event_loop.create_task(coro)
-                cancel_task = event_loop.create_task(cancel(task))
-
-                with async_timeout.timeout(1):
-                    await asyncio.wait([task, cancel_task])
-
-
-@pytest.mark.asyncio
-async def test_stream_context_no_response():
-    async with aiohttp.ClientSession() as session:
-        client = peony.client.BasePeonyClient("", "", session=session)
-        stream = peony.stream.StreamResponse(method='GET',
-                                             url="http://whatever.com/stream",
-                                             client=client)
-
-        assert stream.response is None
-        await stream.__aexit__()
+    context = peony.stream.StreamResponse(method='GET',
+                                          url="http://whatever.com",
+                                          client=peony_client)
+
+    with context as stream:
+        with patch.object(stream, '_connect',
+                          side_effect=stream_content):
+            coro = test_stream_iterations(stream)
+            task = event_loop.create_task(coro)
+            cancel_task = event_loop.create_task(cancel(task))
+
+            tasks = asyncio.gather(task, cancel_task,
+                                   return_exceptions=True)
+            await asyncio.wait_for(tasks, timeout=1)
+            assert task.cancelled()
+
+
+async def test_stream_context_no_response(peony_client):
+    stream = peony.stream.StreamResponse(method='GET',
+                                         url="http://whatever.com/stream",
+                                         client=peony_client)
+
+    assert stream.response is None
+    await stream.__aexit__()
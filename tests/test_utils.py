@@ -117,11 +117,52 @@ async def test_error_handler_asyncio_timeout(event_loop):
             raise asyncio.TimeoutError
 
     fut = create_future(event_loop)
-    coro = utils.DefaultErrorHandler(timeout)(future=fut, url="http://")
-    await coro
+    with patch.object(asyncio, 'sleep', side_effect=dummy) as sleep:
+        coro = utils.DefaultErrorHandler(timeout)(future=fut, url="http://")
+        await coro
+        assert [call[0][0] for call in sleep.call_args_list] == [1, 2]
+
     assert tries == 0
 
 
+@pytest.mark.asyncio
+async def test_error_handler_asyncio_timeout_tries():
+    async def timeout(**kwargs):
+        raise asyncio.TimeoutError
+
+    with patch.object(asyncio, 'sleep', side_effect=dummy) as sleep:
+        with pytest.raises(asyncio.TimeoutError):
+            await utils.DefaultErrorHandler(timeout, timeout_tries=2)(
+                url="http://"
+            )
+
+        assert sleep.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_error_handler_rate_limit_backoff():
+    global tries
+    tries = 7
+
+    async def rate_limit(**kwargs):
+        global tries
+        tries -= 1
+
+        if tries > 0:
+            response = MockResponse(error=88,
+                                    headers={'X-Rate-Limit-Reset': 0})
+            await exceptions.throw(response)
+
+    with patch.object(asyncio, 'sleep', side_effect=dummy) as sleep:
+        await utils.DefaultErrorHandler(rate_limit)(url="http://")
+
+        delays = [call[0][0] for call in sleep.call_args_list]
+        backoffs = [60, 120, 240, 480, 960, 960]
+        assert len(delays) == len(backoffs)
+        for delay, backoff in zip(delays, backoffs):
+            assert backoff <= delay <= backoff + utils.RATE_LIMIT_JITTER
+
+
 @pytest.mark.asyncio
 async def test_error_handler_other_exception():
     async def error(**kwargs):
@@ -237,6 +278,19 @@ def test_log_error(logger):
             assert MockResponse.message in output
 
 
+def test_log_error_disabled():
+    logger = logging.getLogger("peony.utils.disabled")
+    logger.disabled = True
+
+    with patch.object(logger, 'error') as error:
+        try:
+            raise RuntimeError
+        except RuntimeError:
+            utils.log_error(logger=logger)
+
+        assert not error.called
+
+
 def test_log_error_no_info():
     logger = logging.getLogger("peony.utils")
     error = setup_logger(logger)
@@ -283,6 +337,44 @@ async def test_get_type_builtin_exception(medias):
         await utils.get_type(f)
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize('data,media_type', [
+    (b'\x89PNG\r\n\x1a\n', "image/png"),
+    (b'\xff\xd8\xff\xe0\x00\x10JFIF', "image/jpeg"),
+    (b'GIF89a', "image/gif"),
+    (b'RIFF\x00\x00\x00\x00WEBPVP8 ', "image/webp"),
+    (b'\x00\x00\x00\x18ftypmp42', "video/mp4"),
+    (b'\x00\x00\x00\x1cftypisom', "video/mp4"),
+    (b'\x00\x00\x00\x14ftypM4V ', "video/mp4"),
+    (b'\x00\x00\x00\x14ftypqt  ', "video/quicktime"),
+])
+async def test_get_type_signature(data, media_type):
+    with patch.object(utils, 'mime') as mime:
+        assert await utils.get_type(data + bytes(1024)) == media_type
+        assert not mime.from_buffer.called
+
+
+@pytest.mark.asyncio
+async def test_get_type_no_signature():
+    with patch.object(utils, 'mime') as mime:
+        mime.from_buffer.return_value = "image/tiff"
+        assert await utils.get_type(b'II*\x00' + bytes(1024)) == "image/tiff"
+        assert mime.from_buffer.called
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('data,media_type', [
+    (b'\x00\x00\x00\x18ftypheic', "image/heic"),
+    (b'\x00\x00\x00\x1cftypavif', "image/avif"),
+    (b'\x00\x00\x00\x20ftypM4A ', "audio/x-m4a"),
+])
+async def test_get_type_other_iso_brands(data, media_type):
+    with patch.object(utils, 'mime') as mime:
+        mime.from_buffer.return_value = media_type
+        assert await utils.get_type(data + bytes(1024)) == media_type
+        assert mime.from_buffer.called
+
+
 def test_get_category():
     assert utils.get_category("image/png") == "tweet_image"
     assert utils.get_category("image/gif") == "tweet_gif"
@@ -294,6 +386,20 @@ def test_get_category_exception():
         utils.get_category("")
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize('aiofiles', [utils.aiofiles, None])
+async def test_open_file(aiofiles):
+    with tempfile.NamedTemporaryFile('w+b') as tmp:
+        tmp.write(b"peony")
+        tmp.flush()
+
+        with patch.object(utils, 'aiofiles', aiofiles):
+            f = await utils.open_file(tmp.name)
+
+        assert await utils.execute(f.read()) == b"peony"
+        await utils.execute(f.close())
+
+
 @pytest.mark.asyncio
 async def test_get_size():
     f = io.BytesIO(bytes(10000))
@@ -301,6 +407,70 @@ async def test_get_size():
     assert f.tell() == 0
 
 
+@pytest.mark.asyncio
+async def test_get_size_file():
+    with tempfile.NamedTemporaryFile('w+b') as tmp:
+        tmp.write(bytes(10000))
+        tmp.flush()
+
+        with patch.object(tmp.file, 'seek') as seek:
+            assert await utils.get_size(tmp.file) == 10000
+            seek.assert_called_once_with(0)
+
+
+@pytest.mark.asyncio
+async def test_get_size_file_not_flushed():
+    with tempfile.TemporaryFile('w+b') as tmp:
+        tmp.write(bytes(1234))
+        assert await utils.get_size(tmp) == 1234
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(utils.aiofiles is None, reason="aiofiles not installed")
+async def test_get_size_aiofiles_not_flushed():
+    with tempfile.NamedTemporaryFile('w+b') as tmp:
+        async with utils.aiofiles.open(tmp.name, 'w+b') as f:
+            await f.write(bytes(1234))
+            assert await utils.get_size(f) == 1234
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('aiofiles', [utils.aiofiles, None])
+async def test_get_size_read_only_not_flushed(aiofiles):
+    with tempfile.NamedTemporaryFile('w+b') as tmp:
+        tmp.write(bytes(1234))
+        tmp.flush()
+
+        with patch.object(utils, 'aiofiles', aiofiles):
+            f = await utils.open_file(tmp.name)
+
+        try:
+            with patch.object(f, 'flush') as flush:
+                assert await utils.get_size(f) == 1234
+                assert not flush.called
+        finally:
+            await utils.execute(f.close())
+
+
+class NoneSeek:
+
+    def __init__(self, f):
+        self.file = f
+
+    def seek(self, *args):
+        self.file.seek(*args)
+
+    def tell(self):
+        return self.file.tell()
+
+
+@pytest.mark.asyncio
+async def test_get_size_seek_returns_none():
+    f = io.BytesIO(bytes(10000))
+    assert await utils.get_size(NoneSeek(f)) == 10000
+    assert f.tell() == 0
+
+
 @pytest.mark.online
 @pytest.mark.asyncio
 async def test_get_size_request(url):
@@ -69,6 +69,33 @@ async def test_upload_media_exception():
             await dummy_peony_client.upload_media([])
 
 
+@pytest.mark.asyncio
+async def test_upload_media_path_closed_on_error():
+    async with DummyPeonyClient() as dummy_peony_client:
+        opened_files = []
+        open_file = utils.open_file
+
+        async def dummy_open_file(path):
+            opened_file = await open_file(path)
+            opened_files.append(opened_file)
+            return opened_file
+
+        with tempfile.NamedTemporaryFile('w+b') as media_file:
+            media_file.write(b"peony")
+            media_file.flush()
+
+            with patch.object(utils, 'open_file',
+                              side_effect=dummy_open_file):
+                with patch.object(dummy_peony_client, '_chunked_upload',
+                                  side_effect=RuntimeError):
+                    with pytest.raises(RuntimeError):
+                        await dummy_peony_client.upload_media(
+                            media_file.name, chunked=True
+                        )
+
+        assert opened_files and opened_files[0].closed
+
+
 @pytest.mark.asyncio
 async def test_upload_media_chunked(medias):
     async with DummyPeonyClient() as dummy_peony_client: